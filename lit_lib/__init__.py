@@ -1,10 +1,28 @@
+import atexit
 import json
+import os
+import shutil
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from enum import Enum
 from pathlib import Path
-from typing import Dict, Optional, Union
+from typing import Dict, Iterator, Optional, Tuple, Union
 
 from deep_translator import GoogleTranslator
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# orjson is just faster on large configs
+_json_loads = orjson.loads if orjson is not None else json.loads
+
+# deep_translator rejects texts of this length or more
+_GOOGLE_MAX_CHARS = 5000
+
 
 class NotFoundInstruction(Enum):
     TRANSLATE = 1
@@ -12,12 +30,32 @@ class NotFoundInstruction(Enum):
     NONE = 3
 
 
+ru_to_en: Dict[str, str] = {
+    "а": "a", "б": "b", "в": "v", "г": "g", "д": "d", "е": "e", "ё": "yo",
+    "ж": "zh", "з": "z", "и": "i", "й": "y", "к": "k", "л": "l", "м": "m",
+    "н": "n", "о": "o", "п": "p", "р": "r", "с": "s", "т": "t", "у": "u",
+    "ф": "f", "х": "kh", "ц": "ts", "ч": "ch", "ш": "sh", "щ": "shch",
+    "ъ": "", "ы": "y", "ь": "", "э": "e", "ю": "yu", "я": "ya",
+}
+
+_RU_TRANSLIT_TABLE = str.maketrans({
+    **ru_to_en,
+    **{k.upper(): v.capitalize() for k, v in ru_to_en.items()},
+})
+
+
+@lru_cache(maxsize=1024)
+def _translit_ru(key: str) -> str:
+    return key.translate(_RU_TRANSLIT_TABLE)
+
+
 class LitLanguage:
     def __init__(
         self,
         name: str,
         phrases: Dict[str, str],
         not_found_instructions: NotFoundInstruction = NotFoundInstruction.TRANSLATE,
+        config: Optional[Dict[str, Dict[str, str]]] = None,
     ):
         """Represents a phrase in a language.
 
@@ -25,12 +63,24 @@ class LitLanguage:
             name: The name of the phrase.
             phrases: The phrases in the language.
             not_found_instructions: The instructions to follow when a phrase is not found.
+            config: The config to add the phrases to once a translation is stored in them.
         """
 
         self.name = name
         self.phrases = phrases
         self.not_found_instructions = not_found_instructions
-
+        self._config = config
+        # phrases is only ever mutated in place, so the bound get stays valid
+        self._get = phrases.get
+
+        nfi = not_found_instructions
+        self._raise_on_miss = nfi is NotFoundInstruction.NONE
+        if nfi is NotFoundInstruction.TRANSLITERATE:
+            self._on_miss = self._translit
+        elif nfi is NotFoundInstruction.TRANSLATE:
+            self._on_miss = self._translate_and_store
+        else:
+            self._on_miss = None
 
     def __getitem__(self, key: str) -> Optional[str]:
         """
@@ -43,22 +93,32 @@ class LitLanguage:
             The translation of the given key.
         """
 
-        nfi = self.not_found_instructions == NotFoundInstruction.NONE
-        if key not in self.phrases.keys() and nfi:
+        result = self._get(key)
+        if result is not None:
+            return result
+
+        if self._raise_on_miss:
             raise KeyError(f"Phrase {key} not found in language {self.name}")
 
-        result = self.phrases.get(key)
-        nfi = self.not_found_instructions == NotFoundInstruction.TRANSLITERATE
-        if nfi and result is None:
-            result = self._translit(key)
+        return self._on_miss(key)
+
+    def _translate_and_store(self, key: str) -> str:
+        """
+        Translate the given key and remember the result in the phrases.
+
+        Args:
+            key: The key to translate.
+
+        Returns:
+            The translated key.
+        """
+        result = Lit._translate(self.name, key)
+        self.phrases[key] = result
+        if self._config is not None:
+            self._config.setdefault(self.name, self.phrases)
 
-        nfi = self.not_found_instructions == NotFoundInstruction.TRANSLATE
-        if nfi and result is None:
-            result = Lit._translate(self.name, key)
-            self.phrases[key] = result
-        
         return result
-    
+
     def _translit(self, key: str) -> str:
         """
         Transliterate the given key.
@@ -69,7 +129,7 @@ class LitLanguage:
         Returns:
             The transliterated key.
         """
-        return key
+        return _translit_ru(key)
 
     def __contains__(self, key: str) -> bool:
         """
@@ -82,7 +142,7 @@ class LitLanguage:
             True if the key is in the dictionary, False otherwise.
         """
         
-        return key in self.phrases.keys() or not self.not_found_instructions == NotFoundInstruction.NONE
+        return key in self.phrases or self.not_found_instructions is not NotFoundInstruction.NONE
     
     def __repr__(self) -> str:
         return f"<LitLanguage name={self.name}>"
@@ -101,12 +161,17 @@ class LitLanguage:
 
 
 class Lit:
+    # GoogleTranslator keeps the text of the current request on the instance,
+    # so a translator must never be shared between threads
+    _local = threading.local()
+
     def __init__(
             self, 
             config_path: Union[str, Path], 
             not_found_instructions: NotFoundInstruction = NotFoundInstruction.TRANSLATE, 
             json_as_str: str = None, 
-            diasble_warnings: bool = False
+            diasble_warnings: bool = False,
+            flush_on_exit: bool = False
         ) -> None:
         """
         Initialize the class.
@@ -116,14 +181,25 @@ class Lit:
             not_found_instructions: Instructions for the not found keys.
             json_as_str: JSON string.
             diasble_warnings: Disable warnings.
+            flush_on_exit: Save the config (with new translations) back to config_path on exit.
+                The object is then kept alive until the interpreter exits.
+
+        Raises:
+            ValueError: If flush_on_exit is used with json_as_str, which has no file to save to.
         """
+        if flush_on_exit and json_as_str is not None:
+            raise ValueError("flush_on_exit needs a config file, it can't be used with json_as_str")
+
         self.warnings = diasble_warnings
-        
+        self.not_found_instructions = not_found_instructions
+        self.langs: Dict[str, LitLanguage] = {}
+        self._translate_memo: Dict[Tuple[str, str], str] = {}
+
         if json_as_str is not None:
-            self.config = json.loads(json_as_str)
+            self.config = _json_loads(json_as_str)
             self.config_path = "JSON_STRING"
             
-        elif config_path is Path:
+        elif isinstance(config_path, Path):
             if not self.warnings:
                 print("WARNING: Dont use file config for production applications (use json_as_str)!")
             self.config_path = config_path
@@ -134,23 +210,63 @@ class Lit:
             self.config_path = Path(config_path)
         
         if self.config_path != "JSON_STRING":
-            if not self.config_path.exists():
-                raise FileNotFoundError(f"Config file {self.config_path} not found")
-
-            self.not_found_instructions = not_found_instructions
             self.config = self._load_config()
-            self.langs = {}
+
+        if flush_on_exit:
+            atexit.register(self.save)
 
     def _load_config(self) -> dict:
-        with self.config_path.open(encoding="utf-8") as f:
+        # orjson takes the raw bytes, json must not guess the encoding of non UTF-8 files
+        try:
+            if orjson is not None:
+                f = self.config_path.open("rb")
+            else:
+                f = self.config_path.open(encoding="utf-8")
+        except FileNotFoundError:
+            raise FileNotFoundError(f"Config file {self.config_path} not found")
+
+        with f:
             try:
-                return json.load(f)
+                return orjson.loads(f.read()) if orjson is not None else json.load(f)
 
             except json.decoder.JSONDecodeError:
                 raise ValueError(f"Config file {self.config_path} is not" 
                                  f" a valid JSON file")
             
     
+    def save(self, path: Optional[Union[str, Path]] = None) -> None:
+        """
+        Atomically write the config, including translations made so far, to a file.
+
+        Args:
+            path: The file to write to. Defaults to the config file the object was loaded from.
+
+        Raises:
+            ValueError: If no path is given and the config was loaded from a JSON string.
+        """
+        if path is None:
+            if self.config_path == "JSON_STRING":
+                raise ValueError("Config was loaded from a JSON string, pass a path to save it")
+            path = self.config_path
+
+        path = Path(path)
+        fd, tmp_path = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(self.config, f, ensure_ascii=False, indent=4)
+            # mkstemp creates the file as 0600, keep the mode of the file being replaced
+            # or use the one a plain open() would have given a new file
+            try:
+                shutil.copymode(path, tmp_path)
+            except FileNotFoundError:
+                umask = os.umask(0)
+                os.umask(umask)
+                os.chmod(tmp_path, 0o666 & ~umask)
+            os.replace(tmp_path, path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+
     def __repr__(self) -> str:
         return f"<Lit config_path={self.config_path}>"
     
@@ -180,16 +296,23 @@ class Lit:
         Raises:
             KeyError: If the language is not found in the config file.
         """
- 
-        if key not in self.config and self.not_found_instructions == NotFoundInstruction.NONE:
+
+        cached = self.langs.get(key)
+        if cached is not None:
+            return cached
+
+        if key not in self.config and self.not_found_instructions is NotFoundInstruction.NONE:
             raise KeyError(f"Language {key} not found in config file")
-        
-        if key not in self.langs.keys():
-            res = LitLanguage(key, self.config.get(key, {}), not_found_instructions= self.not_found_instructions)
-            self.langs[key] = res
 
+        # Share the config dict so translated phrases are written back into it,
+        # a missing language is only added to the config on its first translation
+        phrases = self.config.get(key)
+        if phrases is None:
+            phrases = {}
+        res = LitLanguage(key, phrases, not_found_instructions=self.not_found_instructions, config=self.config)
+        self.langs[key] = res
 
-        return self.langs[key]
+        return res
 
     def __setitem__(self, key: str, phrases: list[tuple[str, str]]) -> None:
         """
@@ -199,17 +322,70 @@ class Lit:
             key: The key to add to the config dictionary.
             phrases: A list of tuples containing the phrase to translate and the alias to use.
         """
-        res_dict = {}
-        for k, alias in phrases:
-            res_dict[alias] = self._translate(key, k)
+        self._store(key, self._translate_phrases(key, phrases))
 
-        if key in self.config.keys():
+    def set_many(self, items: Dict[str, list[tuple[str, str]]], max_workers: int = 4) -> None:
+        """
+        Add several keys to the config dictionary, translating them in parallel.
+
+        Nothing is added to the config if any of the translations fails.
+
+        Args:
+            items: A mapping of key to the list of (phrase, alias) tuples, as for __setitem__.
+            max_workers: The number of translation requests to run at once.
+        """
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = {
+                key: executor.submit(self._translate_phrases, key, phrases)
+                for key, phrases in items.items()
+            }
+
+        # Collect every result before storing any, so a failure raises here
+        results = {key: future.result() for key, future in futures.items()}
+        for key, res_dict in results.items():
+            self._store(key, res_dict)
+
+    def _translate_phrases(self, key: str, phrases: list[tuple[str, str]]) -> Dict[str, str]:
+        translations = self._translate_many(key, [k for k, _ in phrases])
+        return {alias: tr for (_, alias), tr in zip(phrases, translations)}
+
+    def _store(self, key: str, res_dict: Dict[str, str]) -> None:
+        if key in self.config:
             self.config[key].update(res_dict)
         else:
+            # A cached language not yet in the config owns a detached dict, attach that one
+            # so objects already handed out keep writing into the config
+            lang = self.langs.get(key)
+            if lang is not None:
+                lang.phrases.update(res_dict)
+                res_dict = lang.phrases
             self.config[key] = res_dict
 
-    @staticmethod
-    def _translate(lang: str, phrase: str) -> str:  # type: ignore
+    @classmethod
+    def _get_translator(cls, lang: str) -> GoogleTranslator:
+        """
+        Get the current thread's translator for a given language, creating it on first use.
+
+        Args:
+            lang: The language to translate to.
+
+        Returns:
+            The translator for the language.
+        """
+
+        translators = getattr(cls._local, "translators", None)
+        if translators is None:
+            translators = cls._local.translators = {}
+
+        translator = translators.get(lang)
+        if translator is None:
+            translator = GoogleTranslator(source='auto', target=lang.lower())
+            translators[lang] = translator
+
+        return translator
+
+    @classmethod
+    def _translate(cls, lang: str, phrase: str) -> str:  # type: ignore
         """
         Translate a phrase to a given language using Google Translate.
 
@@ -221,11 +397,91 @@ class Lit:
             The translated phrase.
         """
 
-        translator = GoogleTranslator(source='auto', target=lang.lower())
-        result = translator.translate(phrase)
+        return cls._get_translator(lang).translate(phrase)
+
+    @classmethod
+    def _translate_batch(cls, lang: str, phrases: list[str]) -> list[str]:
+        """
+        Translate several phrases to a given language, one request per chunk of phrases.
+
+        GoogleTranslator.translate_batch still sends one request per phrase, so the
+        phrases are joined with newlines instead and the translation is split back.
+
+        Args:
+            lang: The language to translate the phrases to.
+            phrases: The phrases to translate.
+
+        Returns:
+            The translated phrases, in the same order.
+        """
+
+        translator = cls._get_translator(lang)
+        result = []
+
+        for chunk in cls._chunk_phrases(phrases):
+            if len(chunk) == 1:
+                result.append(translator.translate(chunk[0]))
+                continue
+
+            lines = translator.translate("\n".join(chunk)).split("\n")
+            if len(lines) != len(chunk):
+                # Google merged or split lines, fall back to one request per phrase
+                lines = [translator.translate(phrase) for phrase in chunk]
+            result.extend(line.strip() for line in lines)
 
         return result
-    
+
+    @staticmethod
+    def _chunk_phrases(phrases: list[str]) -> Iterator[list[str]]:
+        """
+        Group phrases into newline-joinable chunks that fit in one request.
+
+        Args:
+            phrases: The phrases to group.
+
+        Returns:
+            The chunks, in order. Phrases containing a newline get a chunk of their own.
+        """
+        chunk: list[str] = []
+        size = 0
+
+        for phrase in phrases:
+            if "\n" in phrase:
+                if chunk:
+                    yield chunk
+                    chunk, size = [], 0
+                yield [phrase]
+                continue
+
+            if chunk and size + 1 + len(phrase) >= _GOOGLE_MAX_CHARS:
+                yield chunk
+                chunk, size = [], 0
+
+            size += len(phrase) + (1 if chunk else 0)
+            chunk.append(phrase)
+
+        if chunk:
+            yield chunk
+
+    def _translate_many(self, lang: str, phrases: list[str]) -> list[str]:
+        """
+        Translate phrases, only sending the ones not translated before.
+
+        Args:
+            lang: The language to translate the phrases to.
+            phrases: The phrases to translate.
+
+        Returns:
+            The translated phrases, in the same order.
+        """
+
+        memo = self._translate_memo
+        missing = list(dict.fromkeys(p for p in phrases if (lang, p) not in memo))
+        for phrase, result in zip(missing, self._translate_batch(lang, missing)):
+            memo[(lang, phrase)] = result
+
+        return [memo[(lang, p)] for p in phrases]
+
     def compile_all(self) -> list[Dict]:
         """
         Compile all languages.
@@ -0,0 +1,129 @@
+import json
+import os
+import stat
+import tempfile
+import threading
+import unittest
+from unittest import mock
+
+import lit_lib
+from lit_lib import Lit, LitLanguage, NotFoundInstruction
+
+
+class FakeTranslator:
+    """Stands in for GoogleTranslator, translating each line to "<target>:<line>"."""
+
+    fail_targets: set = set()
+
+    def __init__(self, source: str, target: str) -> None:
+        self.target = target
+
+    def translate(self, text: str) -> str:
+        if self.target in self.fail_targets:
+            raise RuntimeError(f"translation to {self.target} failed")
+        return "\n".join(f"{self.target}:{line}" for line in text.split("\n"))
+
+
+class LitTestCase(unittest.TestCase):
+    def setUp(self) -> None:
+        FakeTranslator.fail_targets = set()
+        patches = [
+            mock.patch.object(lit_lib, "GoogleTranslator", FakeTranslator),
+            # Drop translators cached by earlier tests on this thread
+            mock.patch.object(Lit, "_local", threading.local()),
+        ]
+        for patch in patches:
+            patch.start()
+            self.addCleanup(patch.stop)
+
+        tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp_dir.cleanup)
+        self.tmp_dir = tmp_dir.name
+
+    def write_config(self, name: str, config: dict) -> str:
+        path = os.path.join(self.tmp_dir, name)
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(config, f)
+        return path
+
+
+class SetManyTest(LitTestCase):
+    def test_stores_every_language(self) -> None:
+        lit = Lit(None, json_as_str='{"DE": {"hi": "Hallo"}}')
+
+        lit.set_many({"DE": [("Bye", "bye")], "FR": [("Hi", "hi"), ("Bye", "bye")]})
+
+        self.assertEqual(lit.config, {
+            "DE": {"hi": "Hallo", "bye": "de:Bye"},
+            "FR": {"hi": "fr:Hi", "bye": "fr:Bye"},
+        })
+
+    def test_config_unchanged_when_one_language_fails(self) -> None:
+        lit = Lit(None, json_as_str='{"DE": {"hi": "Hallo"}}')
+        FakeTranslator.fail_targets = {"fi"}
+
+        with self.assertRaises(RuntimeError):
+            lit.set_many({"DE": [("Bye", "bye")], "FI": [("Hi", "hi")], "NL": [("Hi", "hi")]})
+
+        self.assertEqual(lit.config, {"DE": {"hi": "Hallo"}})
+
+
+class SaveTest(LitTestCase):
+    def test_round_trip_keeps_file_mode(self) -> None:
+        path = self.write_config("config.json", {"RU": {"hello": "Привет мир"}})
+        os.chmod(path, 0o640)
+
+        lit = Lit(path, diasble_warnings=True)
+        lit["RU"]["bye"]
+        lit.save()
+
+        self.assertEqual(Lit(path, diasble_warnings=True).config, {
+            "RU": {"hello": "Привет мир", "bye": "ru:bye"},
+        })
+        self.assertEqual(stat.S_IMODE(os.stat(path).st_mode), 0o640)
+        self.assertEqual(os.listdir(self.tmp_dir), ["config.json"])
+
+    def test_new_file_gets_default_mode(self) -> None:
+        path = os.path.join(self.tmp_dir, "new.json")
+        old_umask = os.umask(0o027)
+        self.addCleanup(os.umask, old_umask)
+
+        Lit(None, json_as_str='{"EN": {"a": "b"}}').save(path)
+
+        self.assertEqual(stat.S_IMODE(os.stat(path).st_mode), 0o640)
+
+    def test_unused_language_is_not_saved(self) -> None:
+        path = self.write_config("config.json", {"EN": {"a": "b"}})
+
+        lit = Lit(path, diasble_warnings=True)
+        lit["XX"]
+        lit.save()
+
+        self.assertEqual(Lit(path, diasble_warnings=True).config, {"EN": {"a": "b"}})
+
+    def test_json_string_needs_a_path(self) -> None:
+        lit = Lit(None, json_as_str="{}")
+
+        with self.assertRaises(ValueError):
+            lit.save()
+
+        with self.assertRaises(ValueError):
+            Lit(None, json_as_str="{}", flush_on_exit=True)
+
+
+class TransliterateTest(unittest.TestCase):
+    def test_table(self) -> None:
+        self.assertEqual("привет".translate(lit_lib._RU_TRANSLIT_TABLE), "privet")
+        self.assertEqual("Щука".translate(lit_lib._RU_TRANSLIT_TABLE), "Shchuka")
+        self.assertEqual("ЖЁЛТЫЙ".translate(lit_lib._RU_TRANSLIT_TABLE), "ZhYoLTYY")
+        self.assertEqual("Объём".translate(lit_lib._RU_TRANSLIT_TABLE), "Obyom")
+
+    def test_language_transliterates_missing_phrases(self) -> None:
+        lang = LitLanguage("RU", {"hello": "Привет"}, NotFoundInstruction.TRANSLITERATE)
+
+        self.assertEqual(lang["hello"], "Привет")
+        self.assertEqual(lang["Хорошо, Чебурашка"], "Khorosho, Cheburashka")
+
+
+if __name__ == "__main__":
+    unittest.main()